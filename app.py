@@ -1,49 +1,83 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, flash
-from dotenv import load_dotenv
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 
-from fare_service import compute_trip, normalize_address
+# Load .env before importing fare_service, which reads some settings at import.
+# Skipped in production (config comes from the real environment) so worker
+# boots don't import python-dotenv or touch the filesystem.
+_DOTENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+if (
+    not os.environ.get("FARE_SKIP_DOTENV")
+    and os.environ.get("FLASK_ENV") != "production"
+    and os.path.exists(_DOTENV_PATH)
+):
+    from dotenv import load_dotenv
 
-load_dotenv()
+    load_dotenv(_DOTENV_PATH)
+
+from fare_service import GeocodeUnavailableError, compute_trip
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-key-change-me")
 
 
+def _read_trip_form(data):
+    """
+    Pull (start_address, end_address, mode) out of submitted form/JSON data.
+    Raises ValueError if data isn't an object or a field isn't a string.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object.")
+    fields = []
+    for name in ("start_address", "end_address", "mode"):
+        value = data.get(name)
+        if value is None:
+            value = ""
+        if not isinstance(value, str):
+            raise ValueError(f"'{name}' must be a string.")
+        fields.append(value.strip())
+    start_address, end_address, mode = fields
+    return start_address, end_address, (mode or "car").lower()
+
+
+def _trip_result(result):
+    """Shape a compute_trip() result for the template and the JSON API."""
+    return {
+        # already formatted for display by compute_trip(formatted=True)
+        "distance_km": result["distance_km"],
+        "duration_min": result["duration_min"],
+        "fare_rm": result["fare_rm"],
+        "mode": result.get("mode"),
+        "provider": result.get("provider"),
+        "profile": result.get("profile"),
+        "traffic": result.get("traffic", False),
+        # raw coords for map (lon,lat)
+        "start": result.get("start"),
+        "end": result.get("end"),
+        "geometry": result.get("geometry", []),
+        "steps": result.get("steps", []),
+    }
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
-        start_address = request.form.get("start_address", "").strip()
-        end_address = request.form.get("end_address", "").strip()
-        mode = (request.form.get("mode") or "car").strip().lower()
+        # No-JS fallback; the page's script posts to /api/trip instead
+        start_address, end_address, mode = _read_trip_form(request.form)
         if not start_address or not end_address:
             flash("Please enter both start and dropoff addresses.", "error")
             return redirect(url_for("index"))
         try:
-            # Also show normalized addresses for transparency
-            norm_start = normalize_address(start_address)
-            norm_end = normalize_address(end_address)
-            result = compute_trip(start_address, end_address, mode=mode)
+            # compute_trip normalizes the addresses (raw coordinates are used
+            # as-is); show what it geocoded for transparency
+            result = compute_trip(start_address, end_address, mode=mode, formatted=True, include_steps=True)
             return render_template(
                 "index.html",
                 start_address=start_address,
                 end_address=end_address,
-                norm_start=norm_start,
-                norm_end=norm_end,
+                norm_start=result["norm_start"],
+                norm_end=result["norm_end"],
                 selected_mode=mode,
-                result={
-                    "distance_km": f"{result['distance_km']:.2f}",
-                    "duration_min": f"{result['duration_min']:.1f}",
-                    "fare_rm": f"{result['fare_rm']:.2f}",
-                    "mode": result.get("mode"),
-                    "provider": result.get("provider"),
-                    "profile": result.get("profile"),
-                    # raw coords for map (lon,lat)
-                    "start": result.get("start"),
-                    "end": result.get("end"),
-                    "geometry": result.get("geometry", []),
-                    "steps": result.get("steps", []),
-                },
+                result=_trip_result(result),
             )
         except Exception as e:
             flash(str(e), "error")
@@ -52,5 +86,31 @@ def index():
     return render_template("index.html")
 
 
+@app.route("/api/trip", methods=["POST"])
+def api_trip():
+    """JSON variant of the form POST, used by the page to update in place."""
+    data = request.get_json(silent=True)
+    if data is None:
+        data = request.form
+    try:
+        start_address, end_address, mode = _read_trip_form(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not start_address or not end_address:
+        return jsonify({"error": "Please enter both start and dropoff addresses."}), 400
+    try:
+        result = compute_trip(start_address, end_address, mode=mode, formatted=True, include_steps=True)
+    except GeocodeUnavailableError as e:
+        # Provider outage/rate limit, not a bad address
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "norm_start": result["norm_start"],
+        "norm_end": result["norm_end"],
+        "result": _trip_result(result),
+    })
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), debug=True)
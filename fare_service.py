@@ -1,10 +1,118 @@
+import concurrent.futures
+import functools
 import os
-from typing import Tuple, Dict, Any, Optional, List
-
-import openrouteservice
-import requests
+import random
+import threading
+import time
+from typing import Tuple, Dict, Any, Optional, List, Callable
+
+import httpx
+import numpy as np
+import orjson
 import math
 import re
+from cachetools import TTLCache
+
+
+# Shared HTTP/2 client so all provider calls reuse pooled keep-alive
+# connections (and multiplex concurrent requests to the same host) instead of
+# paying a TCP+TLS handshake per request. The transport retries failed
+# connects; _http_request() retries transient gateway errors.
+_HTTP = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    ),
+    timeout=httpx.Timeout(15.0, connect=5.0),
+    headers={"User-Agent": "FareCalculator/1.0 (+https://example.com)"},
+)
+_RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+def _http_request(method: str, url: str, retries: int = 2, **kwargs: Any) -> httpx.Response:
+    """Send a request on the shared client, retrying 502/503/504 with backoff."""
+    for attempt in range(retries + 1):
+        resp = _HTTP.request(method, url, **kwargs)
+        if resp.status_code not in _RETRY_STATUSES or attempt == retries:
+            return resp
+        time.sleep(0.3 * (2 ** attempt))
+    return resp
+
+
+_ORS_BASE = "https://api.openrouteservice.org"
+
+# Environment-based settings, read once at import instead of on every call.
+# Call reload_config() after changing os.environ (e.g. in tests).
+_ORS_KEY: Optional[str] = None
+_GOOGLE_KEY: Optional[str] = None
+_GEOCODER_COUNTRY = "MY"
+_NOMINATIM_TIMEOUT_S = 20.0
+
+
+def reload_config() -> None:
+    """Re-read environment-based settings into the module constants."""
+    global _ORS_KEY, _GOOGLE_KEY, _GEOCODER_COUNTRY, _NOMINATIM_TIMEOUT_S
+    _ORS_KEY = os.environ.get("OPENROUTESERVICE_API_KEY") or None
+    _GOOGLE_KEY = os.environ.get("GOOGLE_MAPS_API_KEY") or None
+    # Default bias to Malaysia if not provided, helps with local detailed addresses
+    _GEOCODER_COUNTRY = (os.environ.get("GEOCODER_COUNTRY") or "MY").strip().upper()
+    _NOMINATIM_TIMEOUT_S = float(os.environ.get("NOMINATIM_TIMEOUT") or 20)
+
+
+reload_config()
+
+
+# Patterns used by address normalization, compiled once at import
+_RE_WA_TIMESTAMP = re.compile(r"^\s*\[[^\]]+\]\s*")
+_RE_WA_SENDER = re.compile(r"^\s*[+\d][\d\s()\-]*:\s*")
+_RE_WA_LABEL = re.compile(r"^(from|to)\s*:?,?\s*", re.IGNORECASE)
+_RE_POSTAL_CODE = re.compile(r"\b\d{5}\b")
+_RE_WHITESPACE = re.compile(r"\s+")
+# Control whitespace -> plain spaces in one C-level pass
+_WS_TRANS = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+_RE_COUNTRY = re.compile(r"\bMalaysia\b", re.IGNORECASE)
+
+# Common road and place abbreviations (lower-case key -> expansion)
+_ABBREVIATIONS = {
+    "jln": "Jalan",
+    "jl": "Jalan",
+    "lbh": "Lebuh",
+    "lor": "Lorong",
+    "kg": "Kampung",
+    "tmn": "Taman",
+    "bt": "Batu",
+}
+_RE_ABBREVIATION = re.compile(
+    r"\b(" + "|".join(map(re.escape, _ABBREVIATIONS)) + r")\b", re.IGNORECASE
+)
+
+# Common local aliases that improve geocoding (lower-case key -> canonical)
+_ALIASES = {
+    "ioi resort": "IOI Resort City",
+    "putrajya": "Putrajaya",
+}
+# Longest alias first so overlapping entries prefer the most specific match
+_RE_ALIAS = re.compile(
+    "|".join(re.escape(k) for k in sorted(_ALIASES, key=len, reverse=True))
+)
+
+
+def _expand_abbreviation(m: "re.Match[str]") -> str:
+    return _ABBREVIATIONS[m.group(1).lower()]
+
+
+def _expand_alias(m: "re.Match[str]") -> str:
+    return _ALIASES[m.group(0)]
+
+
+# Coordinate input ("3.1390, 101.6869"): exactly two comma-separated numbers,
+# optionally with the ", Malaysia" normalize_address() appends, so addresses
+# starting with a house number don't qualify
+_RE_COORDS = re.compile(
+    r"\s*([+-]?\d+(?:\.\d+)?)\s*,\s*([+-]?\d+(?:\.\d+)?)\s*(?:,\s*malaysia\s*)?",
+    re.IGNORECASE,
+)
 
 
 def _strip_whatsapp_metadata(s: str) -> str:
@@ -16,14 +124,15 @@ def _strip_whatsapp_metadata(s: str) -> str:
         return s
     t = s.strip()
     # Drop leading [timestamp, date] blocks
-    t = re.sub(r"^\s*\[[^\]]+\]\s*", "", t)
+    t = _RE_WA_TIMESTAMP.sub("", t)
     # Drop leading phone/name with trailing colon
-    t = re.sub(r"^\s*[+\d][\d\s()\-]*:\s*", "", t)
+    t = _RE_WA_SENDER.sub("", t)
     # Drop leading From/To labels (with optional colon)
-    t = re.sub(r"^(from|to)\s*:?,?\s*", "", t, flags=re.IGNORECASE)
+    t = _RE_WA_LABEL.sub("", t)
     return t
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_address(address: str) -> str:
     """
     Normalize a free-form, potentially messy address string so geocoders can
@@ -34,6 +143,9 @@ def normalize_address(address: str) -> str:
     - Trim whitespace around commas
     - Collapse multiple internal spaces
     - Remove empty segments
+
+    Results are memoized per raw input, since the same home/office addresses
+    are entered repeatedly.
     """
     if not address:
         return ""
@@ -48,55 +160,31 @@ def normalize_address(address: str) -> str:
     else:
         candidate = str(address)
 
-    # Replace multiple commas with a single comma on the candidate
-    a = candidate
-    a = a.replace("\n", " ")
-    while ",," in a:
-        a = a.replace(",,", ",")
-
-    # Split by comma, trim each segment, drop empties
-    parts = [p.strip() for p in a.split(",")]
-    parts = [p for p in parts if p]
-
-    # Expand common Malaysian abbreviations and aliases within each part
-    def expand_abbrev(part: str) -> str:
-        p = part
+    # Single pass over the comma-separated segments: trim, expand common
+    # Malaysian abbreviations and aliases, and drop empties (which also
+    # collapses runs of commas)
+    parts: List[str] = []
+    for p in candidate.translate(_WS_TRANS).split(","):
         # Remove standalone 5-digit postal codes
-        p = re.sub(r"\b\d{5}\b", "", p)
-        # Common road and place abbreviations
-        replacements = {
-            r"\bJln\b": "Jalan",
-            r"\bJl\b": "Jalan",
-            r"\bLbh\b": "Lebuh",
-            r"\bLor\b": "Lorong",
-            r"\bKg\b": "Kampung",
-            r"\bTmn\b": "Taman",
-            r"\bBt\b": "Batu",
-        }
-        for pat, rep in replacements.items():
-            p = re.sub(pat, rep, p, flags=re.IGNORECASE)
-
-        # Common local aliases that improve geocoding
-        alias_map = {
-            "ioi resort": "IOI Resort City",
-            "putrajya": "Putrajaya",
-        }
-        lower = p.lower()
-        for k, v in alias_map.items():
-            if k in lower:
-                p = re.sub(re.escape(k), v, lower, flags=re.IGNORECASE)
-                break
-        return p.strip()
-
-    parts = [expand_abbrev(p) for p in parts]
+        p = _RE_POSTAL_CODE.sub("", p.strip())
+        # Common road and place abbreviations, expanded in a single pass
+        p = _RE_ABBREVIATION.sub(_expand_abbreviation, p)
+        # Common local aliases that improve geocoding (segment is lower-cased
+        # only when an alias matched)
+        expanded, n = _RE_ALIAS.subn(_expand_alias, p.lower())
+        if n:
+            p = expanded
+        p = p.strip()
+        if p:
+            parts.append(p)
 
     # Re-join with single comma+space
-    a = ", ".join([p for p in parts if p])
+    a = ", ".join(parts)
 
     # Collapse multiple spaces within segments
-    a = " ".join(a.split())
+    a = _RE_WHITESPACE.sub(" ", a).strip()
     # Append country if missing to aid global geocoders
-    if not re.search(r"\b(Malaysia)\b", a, flags=re.IGNORECASE):
+    if not _RE_COUNTRY.search(a):
         a = f"{a}, Malaysia"
     return a
 
@@ -123,34 +211,33 @@ def _simplify_address_for_retry(address: str) -> Optional[str]:
     return None
 
 
-def get_client() -> openrouteservice.Client:
+def _ors_api_key() -> str:
     """
-    Create an OpenRouteService client using the API key from the environment variable
+    Return the OpenRouteService API key from the environment variable
     OPENROUTESERVICE_API_KEY.
     """
-    api_key = os.environ.get("OPENROUTESERVICE_API_KEY")
-    if not api_key:
+    if not _ORS_KEY:
         raise RuntimeError(
             "OPENROUTESERVICE_API_KEY is not set. Please set it in your environment or .env file."
         )
-    return openrouteservice.Client(key=api_key)
+    return _ORS_KEY
 
 
-def geocode_address(client: openrouteservice.Client, address: str) -> Tuple[float, float]:
+def geocode_address(address: str) -> Tuple[float, float]:
     """
-    Geocode an address string to (lon, lat) tuple using Pelias Search.
+    Geocode an address string to (lon, lat) tuple using ORS Pelias Search.
     Returns: (lon, lat)
     Raises ValueError if no results.
     """
     # Optional country bias for Pelias/ORS, e.g., "MY" for Malaysia
-    # Default bias to Malaysia if not provided, helps with local detailed addresses
-    country = (os.environ.get("GEOCODER_COUNTRY") or "MY").strip()
-    pelias_params: Dict[str, Any] = {"text": address}
-    if country:
+    params: Dict[str, Any] = {"api_key": _ors_api_key(), "text": address}
+    if _GEOCODER_COUNTRY:
         # ORS Pelias expects ISO 3166-1 alpha-2 code(s)
-        pelias_params["boundary.country"] = [country.upper()]
+        params["boundary.country"] = _GEOCODER_COUNTRY
 
-    result = client.pelias_search(**pelias_params)
+    resp = _http_request("GET", f"{_ORS_BASE}/geocode/search", params=params, timeout=15)
+    resp.raise_for_status()
+    result = orjson.loads(resp.content)
     features = result.get("features", [])
     if not features:
         raise ValueError(f"No results found for address: {address}")
@@ -159,14 +246,79 @@ def geocode_address(client: openrouteservice.Client, address: str) -> Tuple[floa
     return float(coords[0]), float(coords[1])
 
 
+# Nominatim's usage policy allows at most 1 request/second; going faster gets
+# the server's IP banned. Requests are spaced out process-wide, and a 429's
+# Retry-After pushes the next slot back. The limiter is per process, so with
+# N server processes (WEB_CONCURRENCY, which gunicorn also reads for -w) each
+# one waits N seconds between requests to keep the total at 1 req/s.
+_NOMINATIM_PROCESSES = max(
+    1, int(os.environ.get("NOMINATIM_PROCESSES") or os.environ.get("WEB_CONCURRENCY") or 1)
+)
+_NOMINATIM_MIN_INTERVAL_S = 1.0 * _NOMINATIM_PROCESSES
+# Fail fast instead of blocking a worker when we're told to back off longer
+# (always allowing at least one queued request)
+_NOMINATIM_MAX_WAIT_S = max(5.0, _NOMINATIM_MIN_INTERVAL_S)
+_NOMINATIM_LOCK = threading.Lock()
+_nominatim_next_slot = 0.0  # time.monotonic() at which the next request may start
+
+
+def _wait_for_nominatim_slot() -> None:
+    """
+    Reserve the next free Nominatim request slot, then sleep until it starts.
+    Raises RuntimeError instead of waiting longer than _NOMINATIM_MAX_WAIT_S
+    (counting every request already queued ahead of this one).
+    """
+    global _nominatim_next_slot
+    with _NOMINATIM_LOCK:
+        now = time.monotonic()
+        slot = max(_nominatim_next_slot, now)
+        wait = slot - now
+        if wait > _NOMINATIM_MAX_WAIT_S:
+            raise RuntimeError("Nominatim rate limit in effect; try again shortly.")
+        # Small jitter so workers don't line up on exact second boundaries
+        _nominatim_next_slot = slot + _NOMINATIM_MIN_INTERVAL_S + random.uniform(0.0, 0.1)
+    # Sleep outside the lock so other callers can reserve later slots meanwhile
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _try_claim_nominatim_slot() -> bool:
+    """Claim a Nominatim request slot only if one is free right now."""
+    global _nominatim_next_slot
+    with _NOMINATIM_LOCK:
+        now = time.monotonic()
+        if _nominatim_next_slot > now:
+            return False
+        _nominatim_next_slot = now + _NOMINATIM_MIN_INTERVAL_S + random.uniform(0.0, 0.1)
+        return True
+
+
+def _defer_nominatim(retry_after: Optional[str]) -> None:
+    """Honor a Retry-After header (seconds) from a 429 response."""
+    global _nominatim_next_slot
+    try:
+        delay = float(retry_after) if retry_after else 60.0
+    except ValueError:
+        # HTTP-date form; not worth parsing, back off for a minute
+        delay = 60.0
+    with _NOMINATIM_LOCK:
+        _nominatim_next_slot = max(_nominatim_next_slot, time.monotonic() + delay)
+
+
 def geocode_address_nominatim(address: str) -> Tuple[float, float]:
     """
     Geocode using OpenStreetMap Nominatim public API (no API key required).
+    Calls are rate limited to 1 request/second per process.
     Returns (lon, lat).
     """
+    _wait_for_nominatim_slot()
+    return _nominatim_search(address)
+
+
+def _nominatim_search(address: str) -> Tuple[float, float]:
+    """Nominatim lookup for a caller that already holds a rate-limit slot."""
     url = "https://nominatim.openstreetmap.org/search"
-    # Default bias to Malaysia if not provided
-    country = (os.environ.get("GEOCODER_COUNTRY") or "my").strip().lower()
+    country = _GEOCODER_COUNTRY.lower()
     params = {
         "q": address,
         "format": "jsonv2",
@@ -178,12 +330,12 @@ def geocode_address_nominatim(address: str) -> Tuple[float, float]:
     if country:
         # Nominatim expects lower-case comma-separated country codes
         params["countrycodes"] = country
-    headers = {
-        "User-Agent": "FareCalculator/1.0 (+https://example.com)"
-    }
-    resp = requests.get(url, params=params, headers=headers, timeout=15)
+    # No automatic retries here: the rate limiter above decides pacing
+    resp = _http_request("GET", url, retries=0, params=params, timeout=_NOMINATIM_TIMEOUT_S)
+    if resp.status_code == 429:
+        _defer_nominatim(resp.headers.get("Retry-After"))
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     if not data:
         raise ValueError(f"No results found for address: {address}")
     # Prefer highest importance
@@ -194,134 +346,362 @@ def geocode_address_nominatim(address: str) -> Tuple[float, float]:
     return lon, lat  # return (lon, lat)
 
 
+# Geocode results keyed on (normalized address, country bias). Addresses
+# rarely move, so entries are kept for 30 days unless overridden.
+_GEOCODE_CACHE_TTL_S = float(os.environ.get("GEOCODE_CACHE_TTL_SECONDS") or 30 * 24 * 3600)
+_GEOCODE_CACHE: "TTLCache[Tuple[str, str], Tuple[float, float]]" = TTLCache(
+    maxsize=10_000, ttl=_GEOCODE_CACHE_TTL_S
+)
+# Addresses that failed every provider, kept briefly so repeated bad input
+# doesn't re-hit the upstreams (and risk a Nominatim ban).
+_GEOCODE_NEG_CACHE_TTL_S = float(os.environ.get("GEOCODE_NEGATIVE_CACHE_TTL_SECONDS") or 600)
+_GEOCODE_NEG_CACHE: "TTLCache[Tuple[str, str], str]" = TTLCache(
+    maxsize=10_000, ttl=_GEOCODE_NEG_CACHE_TTL_S
+)
+# Lookups currently being fetched, so concurrent callers asking for the same
+# address wait on one upstream request instead of each issuing their own.
+_GEOCODE_INFLIGHT: Dict[Tuple[str, str], "concurrent.futures.Future[Tuple[float, float]]"] = {}
+# Guards the caches above and _GEOCODE_INFLIGHT
+_GEOCODE_CACHE_LOCK = threading.RLock()
+
+
+# Worker pool used to geocode a trip's end while the request thread geocodes
+# its start; kept at module scope so requests don't pay for thread creation.
+# Each in-flight trip holds one worker, so size it to the expected request
+# concurrency (wsgi.py raises the default for gevent, where workers are
+# greenlets).
+_GEOCODE_WORKERS = int(os.environ.get("GEOCODE_WORKERS") or 32)
+_GEOCODE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=_GEOCODE_WORKERS, thread_name_prefix="geocode"
+)
+
+
+# Separate pool for ORS calls made by _geocode_text (every ORS lookup runs
+# here, so it is sized like _GEOCODE_EXECUTOR); the callers may already run
+# on _GEOCODE_EXECUTOR, so sharing it could deadlock.
+_PROVIDER_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=_GEOCODE_WORKERS, thread_name_prefix="geocode-provider"
+)
+# Hedged Nominatim calls get their own small pool: at 1 req/s they can't use
+# more, and they must never hold up ORS calls.
+_NOMINATIM_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="geocode-nominatim"
+)
+# How long ORS may take before a Nominatim request is hedged alongside it
+_NOMINATIM_HEDGE_DELAY_S = 1.0
+
+
+def _geocode_cache_key(address: str) -> Tuple[str, str]:
+    return normalize_address(address), _GEOCODER_COUNTRY
+
+
+def _try_parse_coords(s: str) -> Optional[Tuple[float, float]]:
+    """
+    Parse raw coordinates like "lat, lon" or "lon, lat". The whole string
+    must be the two numbers (plus an optional ", Malaysia"). Returns
+    (lon, lat), or None if s doesn't look like coordinates.
+    """
+    m = _RE_COORDS.fullmatch(s) if s else None
+    if m is None:
+        return None
+    a = float(m.group(1))
+    b = float(m.group(2))
+    # Heuristic: if first looks like lat (-90..90) and second like lon (-180..180), interpret as lat,lon
+    if -90.0 <= a <= 90.0 and -180.0 <= b <= 180.0:
+        lat, lon = a, b
+    elif -180.0 <= a <= 180.0 and -90.0 <= b <= 90.0:
+        # Otherwise assume lon,lat
+        lon, lat = a, b
+    else:
+        # Out of range either way, so not coordinates
+        return None
+    return (lon, lat)
+
+
 def robust_geocode(address: str) -> Tuple[float, float]:
     """
     Geocode with multiple strategies:
-    1) If ORS API key is present, try ORS Pelias with country bias.
+    1) If ORS API key is present, try ORS Pelias with country bias (racing
+       Nominatim against it if ORS is slow and a Nominatim slot is free).
     2) Fall back to Nominatim with country bias.
     3) If both fail, try a simplified version of the address with both providers.
+    Successful lookups are cached (see GEOCODE_CACHE_TTL_SECONDS); addresses
+    that fail every attempt are remembered for a shorter window.
     Raises ValueError with a helpful message if all attempts fail.
     """
-    # 0) Accept raw coordinates like "lat, lon" or "lon, lat", even with extra text
-    def _try_parse_coords(s: str) -> Optional[Tuple[float, float]]:
-        if not s:
-            return None
-        # Find all numbers in the string (integers or decimals with optional sign)
-        nums = re.findall(r"[+-]?(?:\d+(?:\.\d+)?)", s)
-        if len(nums) < 2:
-            return None
-        a = float(nums[0])
-        b = float(nums[1])
-        # Heuristic: if first looks like lat (-90..90) and second like lon (-180..180), interpret as lat,lon
-        if -90.0 <= a <= 90.0 and -180.0 <= b <= 180.0:
-            lat, lon = a, b
-        else:
-            # Otherwise assume lon,lat
-            lon, lat = a, b
-        return (lon, lat)
-
+    # 0) Accept raw coordinates like "lat, lon" or "lon, lat"
     parsed = _try_parse_coords(address)
     if parsed:
         return parsed
-    api_key = os.environ.get("OPENROUTESERVICE_API_KEY")
 
-    # 1) Primary attempt(s)
-    if api_key:
-        try:
-            client = get_client()
-            return geocode_address(client, address)
-        except Exception:
-            pass  # fall through to Nominatim
+    key = _geocode_cache_key(address)
+    with _GEOCODE_CACHE_LOCK:
+        cached = _GEOCODE_CACHE.get(key)
+        failure = _GEOCODE_NEG_CACHE.get(key)
+        inflight = _GEOCODE_INFLIGHT.get(key)
+        if cached is None and failure is None and inflight is None:
+            # First caller for this key fetches; later ones wait on its future
+            fut: "concurrent.futures.Future[Tuple[float, float]]" = concurrent.futures.Future()
+            _GEOCODE_INFLIGHT[key] = fut
+    if cached is not None:
+        return cached
+    if failure is not None:
+        raise ValueError(failure)
+    if inflight is not None:
+        return inflight.result()
 
     try:
-        return geocode_address_nominatim(address)
+        result = _geocode_with_fallbacks(address)
+    except BaseException as e:
+        with _GEOCODE_CACHE_LOCK:
+            # Only remember genuine misses, not provider outages/rate limits
+            if isinstance(e, ValueError) and not isinstance(e, GeocodeUnavailableError):
+                _GEOCODE_NEG_CACHE[key] = str(e)
+            _GEOCODE_INFLIGHT.pop(key, None)
+        fut.set_exception(e)
+        raise
+    with _GEOCODE_CACHE_LOCK:
+        _GEOCODE_CACHE[key] = result
+        _GEOCODE_INFLIGHT.pop(key, None)
+    fut.set_result(result)
+    return result
+
+
+class GeocodeUnavailableError(ValueError):
+    """All attempts failed, but at least one because a provider errored
+    (HTTP failure, rate limit, ...) rather than finding nothing. The address
+    may well be fine, so callers should ask the user to retry."""
+
+
+def _provider_outcome(
+    geocode: Callable[[], Tuple[float, float]]
+) -> Tuple[Optional[Tuple[float, float]], bool]:
+    """
+    Call geocode and return (result or None, whether it errored rather than
+    finding nothing).
+    """
+    try:
+        return geocode(), False
+    except orjson.JSONDecodeError:
+        # Truncated/HTML body: a provider hiccup, not a miss (JSONDecodeError
+        # is a ValueError, so it must be caught first)
+        return None, True
+    except ValueError:
+        return None, False  # no results from this provider
     except Exception:
-        pass
-
-    # 2) Simplify and retry
-    simplified = _simplify_address_for_retry(address)
-    if simplified:
-        if api_key:
-            try:
-                client = get_client()
-                return geocode_address(client, simplified)
-            except Exception:
-                pass
-        try:
-            return geocode_address_nominatim(simplified)
-        except Exception:
-            pass
+        return None, True
+
 
+def _geocode_text(text: str) -> Tuple[Optional[Tuple[float, float]], bool]:
+    """
+    Geocode text with ORS (if configured) as the primary provider. If ORS
+    hasn't answered within _NOMINATIM_HEDGE_DELAY_S, Nominatim is raced
+    alongside it, but only when a rate-limit slot is free right now. If ORS
+    fails, Nominatim is used as the fallback.
+    Returns (result or None, whether any provider errored rather than
+    finding nothing).
+    """
+    upstream_error = False
+    if _ORS_KEY:
+        futures = [_PROVIDER_EXECUTOR.submit(_provider_outcome, lambda: geocode_address(text))]
+        done, _ = concurrent.futures.wait(futures, timeout=_NOMINATIM_HEDGE_DELAY_S)
+        if not done and _try_claim_nominatim_slot():
+            futures.append(
+                _NOMINATIM_EXECUTOR.submit(_provider_outcome, lambda: _nominatim_search(text))
+            )
+        for fut in concurrent.futures.as_completed(futures):
+            result, errored = fut.result()
+            upstream_error = upstream_error or errored
+            if result is not None:
+                # A hedged request still running finishes in the background
+                return result, upstream_error
+        if len(futures) > 1:
+            return None, upstream_error  # Nominatim already had its turn
+
+    result, errored = _provider_outcome(lambda: geocode_address_nominatim(text))
+    return result, upstream_error or errored
+
+
+def _geocode_with_fallbacks(address: str) -> Tuple[float, float]:
+    """Run the provider chain described in robust_geocode (no caching)."""
+    upstream_error = False
+    # 1) Full address, then 2) a simplified form. The simplified retry is not
+    # started speculatively: it would spend a Nominatim rate-limit slot on
+    # every lookup and can beat the more precise full-address result.
+    for text in (address, _simplify_address_for_retry(address)):
+        if not text:
+            continue
+        result, errored = _geocode_text(text)
+        upstream_error = upstream_error or errored
+        if result is not None:
+            return result
+
+    if upstream_error:
+        raise GeocodeUnavailableError("Geocoding service is busy, please retry in a moment.")
     raise ValueError(
         "No results found for address after multiple attempts: "
         f"'{address}'. Try a simpler form like 'Area, City, State' or ensure it includes the city/state."
     )
 
 
+_EARTH_RADIUS_M = 6371000.0
+
+
 def haversine_meters(a: Tuple[float, float], b: Tuple[float, float]) -> float:
     """
     Compute haversine distance in meters between two (lon, lat) coordinates.
     """
     lon1, lat1 = a
     lon2, lat2 = b
-    R = 6371000.0
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
+    dphi = phi2 - phi1
     dlambda = math.radians(lon2 - lon1)
     h = (
         math.sin(dphi / 2) ** 2
         + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
     )
-    return 2 * R * math.asin(math.sqrt(h))
+    return 2 * _EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+def haversine_meters_pairwise(a_lonlat: np.ndarray, b_lonlat: np.ndarray) -> np.ndarray:
+    """
+    Vectorized haversine between matching rows of two (N, 2) arrays of
+    (lon, lat) points (either side may also be a single point, which is
+    broadcast). Returns N distances in meters.
+    """
+    a = np.asarray(a_lonlat, dtype=np.float64)
+    b = np.asarray(b_lonlat, dtype=np.float64)
+    phi1 = np.radians(a[..., 1])
+    phi2 = np.radians(b[..., 1])
+    dphi = phi2 - phi1
+    dlam = np.radians(b[..., 0] - a[..., 0])
+    h = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(h))
+
+
+def haversine_meters_batch(lonlats: np.ndarray) -> np.ndarray:
+    """
+    Vectorized haversine over a polyline of (lon, lat) points.
+    Takes an (N, 2) array and returns the N-1 segment lengths in meters;
+    sum the result for the total path length.
+    """
+    pts = np.asarray(lonlats, dtype=np.float64)
+    return haversine_meters_pairwise(pts[:-1], pts[1:])
+
+
+class HaversineIndex:
+    """
+    A fixed set of (lon, lat) points (e.g. taxi stands or pickup points) with
+    per-point trig precomputed, so repeated distance/nearest queries against
+    it only do the query-dependent half of the haversine formula.
+    """
+
+    def __init__(self, points: np.ndarray) -> None:
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not len(pts):
+            raise ValueError("HaversineIndex needs at least one point")
+        self.points = pts
+        self._lam = np.radians(pts[:, 0])
+        self._phi = np.radians(pts[:, 1])
+        self._cos_phi = np.cos(self._phi)
+
+    def distances(self, query: Tuple[float, float]) -> np.ndarray:
+        """Distance in meters from a (lon, lat) query to every indexed point."""
+        lon, lat = query
+        phi_q = math.radians(lat)
+        lam_q = math.radians(lon)
+        h = (
+            np.sin((self._phi - phi_q) / 2) ** 2
+            + math.cos(phi_q) * self._cos_phi * np.sin((self._lam - lam_q) / 2) ** 2
+        )
+        return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(h))
+
+    def nearest(self, query: Tuple[float, float]) -> Tuple[int, float]:
+        """Return (index, distance in meters) of the indexed point closest to query."""
+        d = self.distances(query)
+        i = int(np.argmin(d))
+        return i, float(d[i])
+
+
+_ORS_PROFILE: Dict[str, str] = {
+    "bike": "cycling-regular",
+    "bicycle": "cycling-regular",
+    "cycling": "cycling-regular",
+    "foot": "foot-walking",
+    "walk": "foot-walking",
+    "walking": "foot-walking",
+    "pedestrian": "foot-walking",
+}
+
+# OSRM demo server uses 'walking' as the profile name
+_OSRM_PROFILE: Dict[str, str] = {
+    "bike": "cycling",
+    "bicycle": "cycling",
+    "cycling": "cycling",
+    "cycle": "cycling",
+    "foot": "walking",
+    "walk": "walking",
+    "walking": "walking",
+    "pedestrian": "walking",
+}
 
 
 def _ors_profile(mode: str) -> str:
     """Map generic mode to an OpenRouteService profile."""
-    m = (mode or "car").lower()
-    if m in ("bike", "bicycle", "cycling"):
-        return "cycling-regular"
-    if m in ("foot", "walk", "walking", "pedestrian"):
-        return "foot-walking"
-    return "driving-car"
+    return _ORS_PROFILE.get((mode or "car").lower(), "driving-car")
 
 
 def _osrm_profile(mode: str) -> str:
     """Map generic mode to an OSRM profile path fragment."""
-    m = (mode or "car").lower()
-    if m in ("bike", "bicycle", "cycling", "cycle"):
-        return "cycling"
-    if m in ("foot", "walk", "walking", "pedestrian"):
-        # OSRM demo server uses 'walking' as the profile name
-        return "walking"
-    return "driving"
+    return _OSRM_PROFILE.get((mode or "car").lower(), "driving")
 
 
 def route_summary(
-    client: openrouteservice.Client,
     start: Tuple[float, float],
     end: Tuple[float, float],
     mode: str = "car",
+    need_geometry: bool = True,
+    want_steps: bool = False,
 ) -> Dict[str, Any]:
     """
     Fetch a route using OpenRouteService with geometry and steps.
     Returns dict with distance_m, duration_s, geometry (list[[lon,lat], ...]), and steps if available.
+    With need_geometry=False the route line is not requested (geometry is []).
+    Turn-by-turn steps are only requested/built when want_steps=True.
     """
     profile = _ors_profile(mode)
-    route = client.directions(
-        coordinates=[start, end],
-        profile=profile,
-        format="geojson",
-        instructions=True,
-        elevation=False,
+    body: Dict[str, Any] = {
+        "coordinates": [list(start), list(end)],
+        "instructions": want_steps,
+        "elevation": False,
+    }
+    if need_geometry:
+        url = f"{_ORS_BASE}/v2/directions/{profile}/geojson"
+    else:
+        # Plain JSON format lets us drop the polyline from the response
+        url = f"{_ORS_BASE}/v2/directions/{profile}/json"
+        body["geometry"] = False
+    resp = _http_request(
+        "POST",
+        url,
+        json=body,
+        headers={"Authorization": _ors_api_key()},
+        timeout=20,
     )
-    feat = route["features"][0]
-    props = feat["properties"]
+    resp.raise_for_status()
+    route = orjson.loads(resp.content)
+    if need_geometry:
+        feat = route["features"][0]
+        props = feat["properties"]
+        geometry: List[List[float]] = feat.get("geometry", {}).get("coordinates", [])  # [lon, lat]
+    else:
+        props = route["routes"][0]
+        geometry = []
     summary = props["summary"]
-    geometry: List[List[float]] = feat.get("geometry", {}).get("coordinates", [])  # [lon, lat]
 
     steps: List[Dict[str, Any]] = []
-    segs = props.get("segments") or []
+    segs = (props.get("segments") or []) if want_steps else []
     if segs:
         for seg in segs:
             for s in seg.get("steps", []):
@@ -346,28 +726,29 @@ def route_summary_osrm(
     start: Tuple[float, float],
     end: Tuple[float, float],
     mode: str = "car",
+    need_geometry: bool = True,
+    want_steps: bool = False,
 ) -> Dict[str, Any]:
     """
     Fetch route using the public OSRM demo server with geometry and steps.
     Returns dict with distance_m, duration_s, geometry (list[[lon,lat], ...]).
+    With need_geometry=False the route line is not requested (geometry is []).
+    Turn-by-turn steps are only requested/built when want_steps=True.
     """
     profile = _osrm_profile(mode)
     base = f"https://router.project-osrm.org/route/v1/{profile}"
     coords = f"{start[0]},{start[1]};{end[0]},{end[1]}"
     url = f"{base}/{coords}"
     params = {
-        "overview": "full",
+        "overview": "full" if need_geometry else "false",
         "geometries": "geojson",
-        "steps": "true",
+        "steps": "true" if want_steps else "false",
         "alternatives": "false",
         "annotations": "false",
     }
-    headers = {
-        "User-Agent": "FareCalculator/1.0 (+https://example.com)"
-    }
-    resp = requests.get(url, params=params, headers=headers, timeout=20)
+    resp = _http_request("GET", url, params=params, timeout=20)
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     routes = data.get("routes") or []
     if not routes:
         raise ValueError("No route found between the provided locations.")
@@ -375,7 +756,7 @@ def route_summary_osrm(
     geometry: List[List[float]] = r0.get("geometry", {}).get("coordinates", [])
 
     steps: List[Dict[str, Any]] = []
-    legs = r0.get("legs") or []
+    legs = (r0.get("legs") or []) if want_steps else []
     for leg in legs:
         for s in leg.get("steps", []):
             steps.append({
@@ -397,61 +778,63 @@ def route_summary_osrm(
 
 
 # --- Google Directions (traffic-aware) optional backend ---
+_GOOGLE_MODE: Dict[str, str] = {
+    "bike": "bicycling",
+    "bicycle": "bicycling",
+    "cycling": "bicycling",
+    "cycle": "bicycling",
+    "foot": "walking",
+    "walk": "walking",
+    "walking": "walking",
+    "pedestrian": "walking",
+}
+
+
 def _google_mode(mode: str) -> str:
-    m = (mode or "car").lower()
-    if m in ("bike", "bicycle", "cycling", "cycle"):
-        return "bicycling"
-    if m in ("foot", "walk", "walking", "pedestrian"):
-        return "walking"
-    return "driving"
+    return _GOOGLE_MODE.get((mode or "car").lower(), "driving")
 
 
 def _polyline_decode(encoded: str) -> List[List[float]]:
     """Decode Google encoded polyline into [[lon, lat], ...]."""
     if not encoded:
         return []
-    coords: List[List[float]] = []
-    index = lat = lng = 0
-    length = len(encoded)
-
-    while index < length:
-        result = shift = 0
-        while True:
-            b = ord(encoded[index]) - 63
-            index += 1
-            result |= (b & 0x1f) << shift
-            shift += 5
-            if b < 0x20:
-                break
-        dlat = ~(result >> 1) if (result & 1) else (result >> 1)
-        lat += dlat
-
-        result = shift = 0
-        while True:
-            b = ord(encoded[index]) - 63
-            index += 1
-            result |= (b & 0x1f) << shift
-            shift += 5
-            if b < 0x20:
-                break
-        dlng = ~(result >> 1) if (result & 1) else (result >> 1)
-        lng += dlng
-
-        coords.append([lng / 1e5, lat / 1e5])  # [lon, lat]
-    return coords
+    # Each value is a run of 5-bit chunks (offset by 63, least significant
+    # first); a chunk below 0x20 ends the value. Decode every value at once
+    # with NumPy instead of a per-character Python loop.
+    chunks = np.frombuffer(encoded.encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+    is_last = chunks < 0x20
+    ends = np.flatnonzero(is_last)
+    if ends.size < 2:
+        return []
+    chunks, is_last = chunks[: ends[-1] + 1], is_last[: ends[-1] + 1]
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # Bit offset of each chunk within its value
+    value_idx = np.concatenate(([0], np.cumsum(is_last)[:-1]))
+    shifts = 5 * (np.arange(chunks.size) - starts[value_idx])
+    values = np.add.reduceat((chunks & 0x1f) << shifts, starts)
+    # Undo zigzag sign encoding, then the delta encoding; values alternate lat, lng
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+    n = deltas.size // 2
+    lat = np.cumsum(deltas[0 : 2 * n : 2])
+    lng = np.cumsum(deltas[1 : 2 * n : 2])
+    return (np.column_stack((lng, lat)) / 1e5).tolist()  # [lon, lat]
 
 
 def route_summary_google(
     start: Tuple[float, float],
     end: Tuple[float, float],
     mode: str = "car",
+    need_geometry: bool = True,
+    want_steps: bool = False,
 ) -> Dict[str, Any]:
     """
     Google Directions API. Uses duration_in_traffic for driving if available.
     Returns dict like other backends with geometry and 'traffic' bool.
+    With need_geometry=False the overview polyline is not decoded (geometry is []).
+    Steps are only built when want_steps=True.
     Requires GOOGLE_MAPS_API_KEY in env.
     """
-    api_key = os.environ.get("GOOGLE_MAPS_API_KEY")
+    api_key = _GOOGLE_KEY
     if not api_key:
         raise RuntimeError("GOOGLE_MAPS_API_KEY not set")
 
@@ -466,14 +849,12 @@ def route_summary_google(
     }
     # For driving, ask for traffic now
     if gmode == "driving":
-        import time
         params["departure_time"] = int(time.time())
         params["traffic_model"] = "best_guess"
 
-    headers = {"User-Agent": "FareCalculator/1.0 (+https://example.com)"}
-    resp = requests.get(url, params=params, headers=headers, timeout=25)
+    resp = _http_request("GET", url, params=params, timeout=25)
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     routes = data.get("routes") or []
     if not routes:
         raise ValueError("No route found from Google Directions")
@@ -486,12 +867,15 @@ def route_summary_google(
     # Prefer traffic duration when available
     dur_obj = (leg0.get("duration_in_traffic") if gmode == "driving" else None) or leg0.get("duration")
     dur_s = float((dur_obj or {}).get("value", 0))
-    encoded = (r0.get("overview_polyline") or {}).get("points")
-    geometry = _polyline_decode(encoded)
+    # The Directions API has no field mask, so the polyline is always sent;
+    # we can at least skip decoding it
+    geometry: List[List[float]] = []
+    if need_geometry:
+        geometry = _polyline_decode((r0.get("overview_polyline") or {}).get("points"))
 
     # Steps (optional; keep consistent shape)
     steps: List[Dict[str, Any]] = []
-    for s in (leg0.get("steps") or []):
+    for s in (leg0.get("steps") or []) if want_steps else []:
         steps.append({
             "distance": (s.get("distance") or {}).get("value"),
             "duration": (s.get("duration") or {}).get("value"),
@@ -509,64 +893,198 @@ def route_summary_google(
     }
 
 
-def calculate_fare(distance_m: float, duration_s: float) -> float:
+# Fare formula constants (RM)
+_FARE_BASE = 3.0
+_FARE_PER_KM = 1.0
+_FARE_PER_MIN = 0.5
+
+
+def calculate_fare(distance_km: float, duration_min: float) -> float:
     """
     Simple fare calculation formula:
       base RM 3 + RM 1 per km + RM 0.5 per minute.
     """
-    return 3 + (distance_m / 1000.0) + ((duration_s / 60.0) * 0.5)
+    return _FARE_BASE + _FARE_PER_KM * distance_km + _FARE_PER_MIN * duration_min
+
+
+# Routes keyed on coordinates rounded to 4 decimals (~11 m), so near-identical
+# trips reuse a result. Traffic-aware Google durations go stale quickly; the
+# ORS/OSRM road network is effectively static.
+_ROUTE_CACHE: "TTLCache[Tuple[Any, ...], Dict[str, Any]]" = TTLCache(maxsize=2048, ttl=24 * 3600)
+_TRAFFIC_ROUTE_CACHE: "TTLCache[Tuple[Any, ...], Dict[str, Any]]" = TTLCache(maxsize=2048, ttl=60)
+_ROUTE_CACHE_LOCK = threading.Lock()
+
+
+def _route_cache_key(
+    start: Tuple[float, float],
+    end: Tuple[float, float],
+    mode: str,
+    provider: str,
+    need_geometry: bool,
+    want_steps: bool,
+) -> Tuple[Any, ...]:
+    return (
+        round(start[0], 4), round(start[1], 4),
+        round(end[0], 4), round(end[1], 4),
+        (mode or "car").lower(), provider, need_geometry, want_steps,
+    )
+
+
+def _copy_route_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a cached route summary, including its geometry and steps lists."""
+    copy = dict(summary)
+    copy["geometry"] = [list(p) for p in summary.get("geometry", [])]
+    copy["steps"] = [dict(st) for st in summary.get("steps", [])]
+    return copy
+
+
+def _route_summary_cached(
+    start: Tuple[float, float],
+    end: Tuple[float, float],
+    mode: str,
+    need_geometry: bool = True,
+    want_steps: bool = False,
+) -> Dict[str, Any]:
+    """
+    Route using the best available backend (Google > ORS > OSRM), reusing
+    cached results for near-identical trips. Returns a copy, so callers may
+    modify it without affecting the cache.
+    Raises ValueError if routing fails.
+    """
+    if _GOOGLE_KEY:
+        key = _route_cache_key(start, end, mode, "google", need_geometry, want_steps)
+        with _ROUTE_CACHE_LOCK:
+            summary = _TRAFFIC_ROUTE_CACHE.get(key)
+        if summary is not None:
+            return _copy_route_summary(summary)
+        try:
+            summary = route_summary_google(start, end, mode=mode, need_geometry=need_geometry, want_steps=want_steps)
+        except Exception:
+            pass  # fall back to ORS/OSRM
+        else:
+            with _ROUTE_CACHE_LOCK:
+                _TRAFFIC_ROUTE_CACHE[key] = summary
+            return _copy_route_summary(summary)
+
+    provider = "ors" if _ORS_KEY else "osrm"
+    key = _route_cache_key(start, end, mode, provider, need_geometry, want_steps)
+    with _ROUTE_CACHE_LOCK:
+        summary = _ROUTE_CACHE.get(key)
+    if summary is not None:
+        return _copy_route_summary(summary)
+    try:
+        if _ORS_KEY:
+            summary = route_summary(start, end, mode=mode, need_geometry=need_geometry, want_steps=want_steps)
+        else:
+            summary = route_summary_osrm(start, end, mode=mode, need_geometry=need_geometry, want_steps=want_steps)
+    except Exception as e:
+        raise ValueError(f"Routing failed: {e}")
+    with _ROUTE_CACHE_LOCK:
+        _ROUTE_CACHE[key] = summary
+    return _copy_route_summary(summary)
+
+
+# Trips shorter than this (straight-line metres, per OSRM profile name) are
+# estimated locally instead of calling a routing API; override with
+# SHORT_TRIP_<PROFILE>_M (0 disables the estimate for that profile).
+_SHORT_TRIP_M: Dict[str, float] = {
+    profile: float(os.environ.get(f"SHORT_TRIP_{profile.upper()}_M") or default)
+    for profile, default in (("driving", 1000.0), ("walking", 300.0), ("cycling", 500.0))
+}
+# Average travel speed used for those estimates (m/s); SPEED_<PROFILE>_MPS
+_SPEED_MPS: Dict[str, float] = {
+    profile: float(os.environ.get(f"SPEED_{profile.upper()}_MPS") or default)
+    for profile, default in (("driving", 11.1), ("walking", 1.4), ("cycling", 4.2))
+}
+# Straight-line to road distance factor for short-trip estimates
+_DETOUR_FACTOR = float(os.environ.get("SHORT_TRIP_DETOUR_FACTOR") or 1.3)
 
 
 def compute_trip(
     start_address: str,
     end_address: str,
     mode: str = "car",
+    _normalized: bool = False,
+    formatted: bool = False,
+    need_geometry: bool = True,
+    include_steps: bool = False,
 ) -> Dict[str, Any]:
     """
     High-level function to compute trip details and fare given two addresses.
-    Returns dict with: distance_km, duration_min, fare_rm, start, end
+    Pass _normalized=True if the addresses already went through normalize_address().
+    Returns dict with: distance_km, duration_min, fare_rm, start, end, and
+    norm_start/norm_end (the text that was geocoded; raw coordinates are
+    passed through unchanged).
+    With formatted=True, distance_km/duration_min/fare_rm are display strings
+    ("12.34" km, "5.6" min, "7.89" RM) instead of floats.
+    Pass need_geometry=False when only the fare/distance/duration are needed;
+    the route line is then not fetched and geometry is [].
+    Turn-by-turn steps are only fetched with include_steps=True (otherwise []).
+    Very short trips (see _SHORT_TRIP_M) skip routing and are estimated from
+    the straight-line distance; their provider is "estimate".
     """
-    # Normalize inputs to better handle messy or detailed addresses
-    start_address = normalize_address(start_address)
-    end_address = normalize_address(end_address)
+    # Raw coordinates (e.g. from "Use My Location") need neither
+    # normalization nor geocoding. Only a bare in-range "number, number"
+    # qualifies; anything else (postcodes, WhatsApp prefixes) is normalized
+    # first and may still turn out to be coordinates in robust_geocode.
+    start = _try_parse_coords(start_address)
+    end = _try_parse_coords(end_address)
 
-    # Geocode with robust multi-provider fallback
-    start = robust_geocode(start_address)
-    end = robust_geocode(end_address)
+    # Normalize inputs to better handle messy or detailed addresses
+    if not _normalized:
+        if start is None:
+            start_address = normalize_address(start_address)
+        if end is None:
+            end_address = normalize_address(end_address)
+
+    # Geocode with robust multi-provider fallback; when both sides need a
+    # lookup, the end runs on the pool while this thread does the start.
+    # The same address typed twice only needs one lookup (and no routing, via
+    # the same-point check below).
+    if start is None and end is None and start_address == end_address:
+        start = end = robust_geocode(start_address)
+    else:
+        fut_end = None
+        if end is None and start is None:
+            fut_end = _GEOCODE_EXECUTOR.submit(robust_geocode, end_address)
+        elif end is None:
+            end = robust_geocode(end_address)
+        if start is None:
+            start = robust_geocode(start_address)
+        if fut_end is not None:
+            end = fut_end.result()
 
     # If start and end are effectively the same location (e.g., user entered the same detailed address),
     # return a zero-distance, zero-duration route to avoid routing API errors.
     same_point_threshold_m = 20.0
-    if haversine_meters(start, end) <= same_point_threshold_m:
+    d = haversine_meters(start, end)
+    profile = _osrm_profile(mode)
+    if d <= same_point_threshold_m:
         summary = {"provider": "direct", "profile": mode, "distance_m": 0.0, "duration_s": 0.0, "geometry": [list(start), list(end)], "steps": []}
+    elif d < _SHORT_TRIP_M[profile]:
+        # Too short to be worth a routing round-trip: estimate from the
+        # straight line with a detour factor and an average speed.
+        distance_m = d * _DETOUR_FACTOR
+        summary = {
+            "provider": "estimate",
+            "profile": profile,
+            "distance_m": distance_m,
+            "duration_s": distance_m / _SPEED_MPS[profile],
+            "geometry": [list(start), list(end)],
+            "steps": [],
+        }
     else:
-        # Route using the best available backend (Google > ORS > OSRM)
-        gkey = os.environ.get("GOOGLE_MAPS_API_KEY")
-        if gkey:
-            try:
-                summary = route_summary_google(start, end, mode=mode)
-            except Exception:
-                summary = None
-        else:
-            summary = None
-
-        if not summary:
-            api_key = os.environ.get("OPENROUTESERVICE_API_KEY")
-            if api_key:
-                try:
-                    client = get_client()
-                    summary = route_summary(client, start, end, mode=mode)
-                except Exception as e:
-                    raise ValueError(f"Routing failed: {e}")
-            else:
-                try:
-                    summary = route_summary_osrm(start, end, mode=mode)
-                except Exception as e:
-                    raise ValueError(f"Routing failed: {e}")
+        summary = _route_summary_cached(
+            start, end, mode, need_geometry=need_geometry, want_steps=include_steps
+        )
 
     distance_km = summary["distance_m"] / 1000.0
     duration_min = summary["duration_s"] / 60.0
-    fare_rm = calculate_fare(summary["distance_m"], summary["duration_s"])
+    fare_rm = calculate_fare(distance_km, duration_min)
+    if formatted:
+        distance_km, duration_min, fare_rm = (
+            f"{distance_km:.2f}", f"{duration_min:.1f}", f"{fare_rm:.2f}"
+        )
 
     return {
         "distance_km": distance_km,
@@ -574,6 +1092,8 @@ def compute_trip(
         "fare_rm": fare_rm,
         "start": start,
         "end": end,
+        "norm_start": start_address,
+        "norm_end": end_address,
         "mode": mode,
         "provider": summary.get("provider"),
         "profile": summary.get("profile"),
@@ -5,12 +5,17 @@
 
 import openrouteservice
 import json
-
-# API key is free so i guess its fine to leave it here
-client = openrouteservice.Client(key='eyJvcmciOiI1YjNjZTM1OTc4NTExMTAwMDFjZjYyNDgiLCJpZCI6IjYyZDliMWU4MWQ2NTRiZGE5OWExMWU1ZTcwMDIzOWZjIiwiaCI6Im11cm11cjY0In0=')
+import os
 
 def GeoLocate():
     print()
+    # API key comes from the environment; the client is only created when needed
+    apiKey = os.environ.get('OPENROUTESERVICE_API_KEY')
+    if not apiKey:
+        print("OPENROUTESERVICE_API_KEY is not set. \n")
+        return
+    client = openrouteservice.Client(key=apiKey)
+
     # To use the coordinates here you need to flip it around for Google Maps to work
     # Geolocation of Starting Address
     BothCoordinatesExist = True
@@ -0,0 +1,22 @@
+import os
+import sys
+
+# Tests import the top-level modules directly and must not pick up a local .env
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["FARE_SKIP_DOTENV"] = "1"
+
+import pytest  # noqa: E402
+
+import fare_service  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """No API keys and empty caches, so nothing reaches a real provider."""
+    monkeypatch.setattr(fare_service, "_ORS_KEY", None)
+    monkeypatch.setattr(fare_service, "_GOOGLE_KEY", None)
+    fare_service._GEOCODE_CACHE.clear()
+    fare_service._GEOCODE_NEG_CACHE.clear()
+    fare_service._ROUTE_CACHE.clear()
+    fare_service._TRAFFIC_ROUTE_CACHE.clear()
+    fare_service.normalize_address.cache_clear()
@@ -0,0 +1,66 @@
+import pytest
+
+import app as app_module
+import fare_service
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def fake_route(monkeypatch):
+    def route(start, end, mode, need_geometry=True, want_steps=False):
+        return {
+            "provider": "osrm",
+            "profile": "driving",
+            "distance_m": 5000.0,
+            "duration_s": 600.0,
+            "geometry": [list(start), list(end)],
+            "steps": [],
+        }
+
+    monkeypatch.setattr(fare_service, "_route_summary_cached", route)
+
+
+def test_api_trip_coordinates_skip_geocoding(client, fake_route, monkeypatch):
+    def no_geocode(address):
+        raise AssertionError(f"geocoded {address!r}")
+
+    monkeypatch.setattr(fare_service, "_geocode_with_fallbacks", no_geocode)
+    resp = client.post(
+        "/api/trip",
+        json={"start_address": "3.13901, 101.68690", "end_address": "3.20000, 101.80000"},
+    )
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["result"]["start"] == [101.6869, 3.13901]
+    assert data["result"]["end"] == [101.8, 3.2]
+    assert data["norm_start"] == "3.13901, 101.68690"
+
+
+def test_api_trip_busy_geocoder_is_503(client, monkeypatch):
+    def unavailable(address):
+        raise fare_service.GeocodeUnavailableError("Geocoding service is busy, please retry in a moment.")
+
+    monkeypatch.setattr(fare_service, "_geocode_with_fallbacks", unavailable)
+    resp = client.post("/api/trip", json={"start_address": "KLCC", "end_address": "Mid Valley"})
+    assert resp.status_code == 503
+    assert "busy" in resp.get_json()["error"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    ["[1, 2]", '"x"', "5", '{"start_address": 5, "end_address": "KLCC"}'],
+)
+def test_api_trip_malformed_body_is_json_400(client, body):
+    resp = client.post("/api/trip", data=body, content_type="application/json")
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+
+def test_api_trip_missing_addresses_is_json_400(client):
+    resp = client.post("/api/trip", json={"start_address": "KLCC"})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "Please enter both start and dropoff addresses."
@@ -0,0 +1,173 @@
+import random
+import time
+
+import httpx
+import pytest
+
+import fare_service
+
+
+def _mock_http(monkeypatch, handler):
+    monkeypatch.setattr(fare_service, "_HTTP", httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def test_garbage_provider_body_is_not_negative_cached(monkeypatch):
+    _mock_http(monkeypatch, lambda request: httpx.Response(200, text="<html>Bad gateway</html>"))
+    monkeypatch.setattr(fare_service, "_wait_for_nominatim_slot", lambda: None)
+    with pytest.raises(fare_service.GeocodeUnavailableError):
+        fare_service.robust_geocode("Jalan Ampang, Kuala Lumpur")
+    assert len(fare_service._GEOCODE_NEG_CACHE) == 0
+
+
+def test_route_cache_hands_out_copies(monkeypatch):
+    calls = []
+
+    def osrm(start, end, mode="car", need_geometry=True, want_steps=False):
+        calls.append(1)
+        return {
+            "provider": "osrm", "profile": "driving", "distance_m": 5000.0, "duration_s": 600.0,
+            "geometry": [[101.0, 3.0], [101.1, 3.0]], "steps": [{"distance": 1, "duration": 2}],
+        }
+
+    monkeypatch.setattr(fare_service, "route_summary_osrm", osrm)
+    first = fare_service._route_summary_cached((101.0, 3.0), (101.1, 3.0), "car", want_steps=True)
+    first["geometry"][0][0] = 0.0
+    first["geometry"].append([1.0, 1.0])
+    first["steps"][0]["distance"] = 99
+    second = fare_service._route_summary_cached((101.0, 3.0), (101.1, 3.0), "car", want_steps=True)
+    assert len(calls) == 1
+    assert second["geometry"] == [[101.0, 3.0], [101.1, 3.0]]
+    assert second["steps"] == [{"distance": 1, "duration": 2}]
+
+
+def _no_routing(*args, **kwargs):
+    raise AssertionError("routing API called")
+
+
+@pytest.mark.parametrize("mode, dlon", [("car", 0.008), ("foot", 0.002), ("bike", 0.004)])
+def test_short_trip_is_estimated_without_routing(monkeypatch, mode, dlon):
+    monkeypatch.setattr(fare_service, "_route_summary_cached", _no_routing)
+    result = fare_service.compute_trip("3.0, 101.0", f"3.0, {101.0 + dlon}", mode=mode)
+    assert result["provider"] == "estimate"
+    straight_m = fare_service.haversine_meters(result["start"], result["end"])
+    assert result["distance_km"] == pytest.approx(straight_m * fare_service._DETOUR_FACTOR / 1000.0)
+
+
+def test_short_trip_threshold_can_be_disabled(monkeypatch):
+    monkeypatch.setitem(fare_service._SHORT_TRIP_M, "driving", 0.0)
+    monkeypatch.setattr(
+        fare_service,
+        "_route_summary_cached",
+        lambda *a, **k: {"provider": "osrm", "profile": "driving", "distance_m": 900.0, "duration_s": 90.0},
+    )
+    result = fare_service.compute_trip("3.0, 101.0", "3.0, 101.008")
+    assert result["provider"] == "osrm"
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("3.1390, 101.6869", (101.6869, 3.139)),  # lat, lon
+        ("101.6869, 3.1390", (101.6869, 3.139)),  # lon, lat
+        ("  -3.5 ,  -60  ", (-60.0, -3.5)),
+        ("3.1390, 101.6869, Malaysia", (101.6869, 3.139)),
+        ("3.1390,101.6869, malaysia", (101.6869, 3.139)),
+    ],
+)
+def test_try_parse_coords(text, expected):
+    assert fare_service._try_parse_coords(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "200, 100",  # out of range in either order
+        "95, 95",
+        "12, Jalan SS 2/24, Petaling Jaya",
+        "12 Jalan Ampang, 50450 Kuala Lumpur",
+        "+60167231646: 3.1390, 101.6869",
+        "3.1390, 101.6869, Singapore",
+    ],
+)
+def test_try_parse_coords_rejects_non_coordinates(text):
+    assert fare_service._try_parse_coords(text) is None
+
+
+def _reference_polyline_decode(encoded):
+    """The original per-character decoder, kept as the reference."""
+    coords = []
+    index = lat = lng = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            result = shift = 0
+            while True:
+                b = ord(encoded[index]) - 63
+                index += 1
+                result |= (b & 0x1f) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if (result & 1) else (result >> 1))
+        lat += deltas[0]
+        lng += deltas[1]
+        coords.append([lng / 1e5, lat / 1e5])
+    return coords
+
+
+def _polyline_encode(points):
+    def value(v):
+        v = ~(v << 1) if v < 0 else (v << 1)
+        out = ""
+        while v >= 0x20:
+            out += chr((0x20 | (v & 0x1f)) + 63)
+            v >>= 5
+        return out + chr(v + 63)
+
+    out = ""
+    prev_lat = prev_lng = 0
+    for lon, lat in points:
+        lat_e5, lng_e5 = round(lat * 1e5), round(lon * 1e5)
+        out += value(lat_e5 - prev_lat) + value(lng_e5 - prev_lng)
+        prev_lat, prev_lng = lat_e5, lng_e5
+    return out
+
+
+def test_polyline_decode_matches_reference():
+    # Google's documented example
+    assert fare_service._polyline_decode("_p~iF~ps|U_ulLnnqC_mqNvxq`@") == [
+        [-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252],
+    ]
+    assert fare_service._polyline_decode("") == []
+    rng = random.Random(1)
+    for _ in range(200):
+        points = [(rng.uniform(-180, 180), rng.uniform(-90, 90)) for _ in range(rng.randint(1, 40))]
+        encoded = _polyline_encode(points)
+        assert fare_service._polyline_decode(encoded) == _reference_polyline_decode(encoded)
+
+
+def test_nominatim_limiter_fails_fast_when_queue_is_too_long(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(fare_service.time, "sleep", sleeps.append)
+    monkeypatch.setattr(fare_service, "_nominatim_next_slot", 0.0)
+    start = time.monotonic()
+    granted = 0
+    with pytest.raises(RuntimeError):
+        for _ in range(100):
+            fare_service._wait_for_nominatim_slot()
+            granted += 1
+    # Only as many slots as fit within the cap were handed out, and none
+    # of them was asked to wait longer than the cap
+    assert 1 <= granted <= fare_service._NOMINATIM_MAX_WAIT_S / fare_service._NOMINATIM_MIN_INTERVAL_S + 1
+    assert all(wait <= fare_service._NOMINATIM_MAX_WAIT_S for wait in sleeps)
+    assert fare_service._nominatim_next_slot - start <= (
+        fare_service._NOMINATIM_MAX_WAIT_S + fare_service._NOMINATIM_MIN_INTERVAL_S + 0.2
+    )
+
+
+def test_nominatim_limiter_fails_fast_after_retry_after(monkeypatch):
+    monkeypatch.setattr(fare_service, "_nominatim_next_slot", 0.0)
+    fare_service._defer_nominatim("60")
+    with pytest.raises(RuntimeError):
+        fare_service._wait_for_nominatim_slot()
@@ -0,0 +1,13 @@
+# Patch blocking stdlib I/O before anything imports sockets/ssl (httpx,
+# httpcore), so outbound geocoding/routing calls yield to other greenlets.
+from gevent import monkey
+
+monkey.patch_all()
+
+import os  # noqa: E402
+
+# Pool threads are greenlets once patched, so let the geocode pool keep up
+# with --worker-connections instead of capping concurrent trips.
+os.environ.setdefault("GEOCODE_WORKERS", "1000")
+
+from app import app as application  # noqa: E402